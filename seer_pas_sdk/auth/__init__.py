@@ -1,4 +1,10 @@
+import jwt
+import time
 import requests
+import threading
+
+# Seconds before a token expires at which it is treated as expired.
+_TOKEN_EXPIRY_MARGIN = 60
 
 
 class Auth:
@@ -35,6 +41,25 @@ class Auth:
 
         self.instance = instance
 
+        self.__token = None
+        self._token_expiry = 0
+        self._token_lock = threading.Lock()
+        self.tenant_id = None
+
+    def __getstate__(self):
+        """
+        Pickles the instance without its lock, which can't be pickled, and without its cached tokens, so a copy sent to another process logs in on its own.
+        """
+        state = self.__dict__.copy()
+        del state["_token_lock"]
+        state["_Auth__token"] = None
+        state["_token_expiry"] = 0
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._token_lock = threading.Lock()
+
     def login(self):
         """
         Logs into the PAS instance using the mapped URL and the login credentials (username and password) provided in the constructor.
@@ -61,17 +86,52 @@ class Auth:
         """
         Gets the token from the login response.
 
+        The tokens are reused until shortly before the ID token expires, so repeated calls don't log in again every time. The tenant ID from the token's claims is stored on `tenant_id`.
+
         Returns
         -------
         str
             The token from the login response.
         """
 
-        res = self.login()
+        if self.__token and time.time() < self._token_expiry:
+            return self.__token
 
-        if "id_token" not in res or "access_token" not in res:
-            raise ValueError(
-                "Check if the credentials are correct or if the backend is running or not."
+        # Only one thread logs in when the tokens expire; the others wait
+        # and reuse its tokens.
+        with self._token_lock:
+            if self.__token and time.time() < self._token_expiry:
+                return self.__token
+
+            res = self.login()
+
+            if "id_token" not in res or "access_token" not in res:
+                raise ValueError(
+                    "Check if the credentials are correct or if the backend is running or not."
+                )
+
+            claims = jwt.decode(
+                res["id_token"], options={"verify_signature": False}
             )
 
-        return res["id_token"], res["access_token"]
+            self.__token = res["id_token"], res["access_token"]
+            self._token_expiry = claims.get("exp", 0) - _TOKEN_EXPIRY_MARGIN
+            self.tenant_id = claims.get("custom:tenantId")
+
+            return self.__token
+
+    def invalidate_token(self, id_token=None):
+        """
+        Drops the cached tokens, so the next call to `get_token` logs in again. Used when the PAS instance rejects a token before its expiry, e.g. because it was revoked or the client clock is skewed.
+
+        Parameters
+        ----------
+        id_token : str, optional
+            The ID token that was rejected. If the tokens were already refreshed since it was issued, they are kept. Defaults to None, which always drops the tokens.
+        """
+        with self._token_lock:
+            if id_token is None or (
+                self.__token and self.__token[0] == id_token
+            ):
+                self.__token = None
+                self._token_expiry = 0
@@ -1,24 +1,117 @@
 from dotenv import load_dotenv
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
-from re import sub
+from re import compile as _compile
+from tqdm import tqdm
 
 import pandas as pd
+import logging
 import os
 import io
+import time
 import requests
 import boto3
 import json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from ..auth import Auth
 
 load_dotenv()
 
+_logger = logging.getLogger(__name__)
+
+# Size of the blocks streamed to disk when downloading files.
+_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Files larger than this are uploaded to S3 in parts of `_UPLOAD_CHUNK_SIZE`.
+_UPLOAD_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+_UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Runs of underscores and hyphens, treated as word breaks by `camel_case`.
+_WORD_SEPARATORS = _compile(r"[_-]+")
+
+# MS data file extensions accepted for upload, as a tuple for `str.endswith`.
+_MS_DATA_FILE_EXTENSIONS = (
+    ".d",
+    ".d.zip",
+    ".mzml",
+    ".raw",
+    ".wiff",
+    ".wiff.scan",
+)
+
+# Plate map columns sent with each sample, keyed by their name in the PAS API
+# payload. Any of them may be left out of the file and is then sent blank.
+_PLATE_MAP_FIELDS = {
+    "wellLocation": "Well location",
+    "nanoparticle": "Nanoparticle",
+    "nanoparticleID": "Nanoparticle ID",
+    "control": "Control",
+    "controlID": "Control ID",
+    "instrumentName": "Instrument name",
+    "dateSamplePrep": "Date sample preparation",
+    "sampleVolume": "Sample volume",
+    "peptideConcentration": "Peptide concentration",
+    "peptideMassSample": "Peptide mass sample",
+    "dilutionFactor": "Dilution factor",
+}
+
+# Plate map columns every sample row is keyed on.
+_PLATE_MAP_REQUIRED_COLUMNS = frozenset(
+    {"MS file name", "Sample ID", "Sample name"}
+)
+
+
+def load_json(response):
+    """
+    Decode the JSON body of an HTTP response, using orjson when it is installed.
+
+    orjson is strict JSON and rejects the `NaN`/`Infinity` tokens that statistical payloads can contain, so bodies it can't parse are handed to `Response.json()`. The result therefore doesn't depend on whether orjson is installed.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The response whose body should be decoded.
+
+    Returns
+    -------
+    object
+        The decoded JSON payload.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+
+    return response.json()
 
-def upload_file(file_name, bucket, object_name=None):
+
+def _check_plate_map_columns(df, columns):
+    """
+    Raise a ValueError naming any of `columns` that the plate map `df` lacks.
+    """
+    missing = columns.difference(df.columns)
+    if missing:
+        raise ValueError(
+            f"Plate map file is invalid. Missing columns: {', '.join(sorted(missing))}."
+        )
+
+
+def upload_file(
+    file_name, bucket, object_name=None, max_concurrency=8, s3_client=None
+):
     """
     Upload a file to an S3 bucket.
 
+    Large files are uploaded as a multipart upload, with up to `max_concurrency` parts in flight at once, and are streamed from disk rather than read into memory.
+
     Parameters
     ----------
     file_name : str
@@ -27,6 +120,10 @@ def upload_file(file_name, bucket, object_name=None):
         The name of the bucket to upload to.
     object_name : str
         The name of the object in the bucket. Defaults to `file_name`.
+    max_concurrency : int
+        The number of parts uploaded in parallel. Defaults to 8.
+    s3_client : botocore.client.S3, optional
+        The S3 client to upload with. When uploading a batch of files, create one client for the batch and pass it to each call, since clients are costly to create and safe to share across threads. Defaults to a new client built from the current credentials.
 
     Returns
     -------
@@ -42,15 +139,174 @@ def upload_file(file_name, bucket, object_name=None):
     if object_name is None:
         object_name = os.path.basename(file_name)
 
+    config = TransferConfig(
+        multipart_threshold=_UPLOAD_MULTIPART_THRESHOLD,
+        multipart_chunksize=_UPLOAD_CHUNK_SIZE,
+        max_concurrency=max_concurrency,
+        use_threads=True,
+    )
+
+    if s3_client is None:
+        s3_client = boto3.client("s3")
+
     # Upload the file
-    s3_client = boto3.client("s3")
     try:
-        response = s3_client.upload_file(file_name, bucket, object_name)
-    except ClientError as e:
+        with tqdm(
+            total=os.path.getsize(file_name),
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            desc=os.path.basename(file_name),
+        ) as t:
+            s3_client.upload_file(
+                file_name,
+                bucket,
+                object_name,
+                Config=config,
+                Callback=t.update,
+            )
+    except (ClientError, S3UploadFailedError) as e:
         return False
     return True
 
 
+def download_file(url, path, attempts=3):
+    """
+    Download a file from a URL to a local path, retrying with exponential backoff.
+
+    The file is streamed to `<path>.part` and only moved to `path` once complete. When a transfer is interrupted, the next attempt resumes from the bytes already on disk with an HTTP `Range` request instead of starting over. If `path` already exists with the size the server reports, the body is not downloaded again.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the file, e.g. a presigned S3 URL.
+    path : str
+        The local path to write the file to.
+    attempts : int
+        The number of attempts before giving up. Defaults to 3.
+
+    Returns
+    -------
+    str
+        The path the file was written to.
+
+    Raises
+    ------
+    requests.RequestException, OSError
+        The error of the last attempt, if all attempts failed, or the first error that retrying can't fix, such as a 4xx response.
+
+    Examples
+    --------
+    >>> download_file("presigned_url_here", "/Users/Downloads/someFileNameHere.raw")
+    >>> "/Users/Downloads/someFileNameHere.raw"
+    """
+    part_path = f"{path}.part"
+    written = 0
+
+    # Only a file that was there before this call counts as downloaded.
+    existing_size = os.path.getsize(path) if os.path.isfile(path) else None
+
+    with tqdm(
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        miniters=1,
+        desc=os.path.basename(path),
+    ) as t:
+        for attempt in range(attempts):
+            headers = {"Range": f"bytes={written}-"} if written else {}
+
+            start = time.perf_counter()
+            first_byte = None
+
+            try:
+                with requests.get(
+                    url, headers=headers, stream=True, timeout=(10, 120)
+                ) as r:
+                    r.raise_for_status()
+
+                    # The server ignored the range, so start over.
+                    if written and r.status_code != 206:
+                        written = 0
+                        t.reset()
+
+                    if t.total is None and "Content-Length" in r.headers:
+                        t.total = written + int(r.headers["Content-Length"])
+                        t.refresh()
+
+                    # The file is already on disk in full, skip the body.
+                    if (
+                        not written
+                        and t.total is not None
+                        and existing_size == t.total
+                    ):
+                        t.update(t.total)
+                        return path
+
+                    with open(part_path, "r+b" if written else "wb") as f:
+                        f.seek(written)
+                        resumed_from = written
+
+                        for chunk in r.iter_content(
+                            chunk_size=_DOWNLOAD_CHUNK_SIZE
+                        ):
+                            if first_byte is None:
+                                first_byte = time.perf_counter()
+
+                            f.write(chunk)
+                            written += len(chunk)
+                            t.update(len(chunk))
+
+                    # Older urllib3 releases don't enforce Content-Length, so
+                    # a connection closed early looks like a finished body.
+                    if t.total is not None and written != t.total:
+                        raise requests.ConnectionError(
+                            f"Connection closed after {written} of {t.total} bytes."
+                        )
+
+                if first_byte is not None:
+                    elapsed = time.perf_counter() - start
+                    size = written - resumed_from
+                    _logger.debug(
+                        "Downloaded %s: bytes=%d ttfb=%.3fs total=%.3fs rate=%.1fKiB/s",
+                        os.path.basename(path),
+                        size,
+                        first_byte - start,
+                        elapsed,
+                        size / 1024 / elapsed if elapsed else 0.0,
+                    )
+                break
+            except (requests.RequestException, OSError) as e:
+                if attempt == attempts - 1 or not _is_retryable(e):
+                    # Don't leave a partial file behind for a failed download.
+                    try:
+                        os.remove(part_path)
+                    except FileNotFoundError:
+                        pass
+                    raise
+                time.sleep(2**attempt)
+
+    os.replace(part_path, path)
+    return path
+
+
+def _is_retryable(error):
+    """
+    Whether a failed download attempt is worth retrying: connection errors, timeouts and 5xx responses are, while client errors (e.g. an expired presigned URL) and local disk errors are not.
+    """
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+
+    return isinstance(
+        error,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
+
+
 def dict_to_df(data):
     """
     Returns a Pandas DataFrame from a dictionary.
@@ -157,37 +413,39 @@ def get_sample_info(
     """
 
     df = pd.read_csv(plate_map_file, on_bad_lines="skip")
-    data = df.iloc[:, :]  # all the data in the platemap csv
-    files = data["MS file name"]  # all filenames in the platemap csv
-    local_file_names = set(
-        [os.path.basename(file) for file in ms_data_files]
-    )  # all filenames in the local directory
+    _check_plate_map_columns(df, _PLATE_MAP_REQUIRED_COLUMNS)
+    files = df["MS file name"]  # all filenames in the platemap csv
+    local_file_names = {
+        os.path.basename(file) for file in ms_data_files
+    }  # all filenames in the local directory
     res = []
 
     # Step 1: Check if ms_data_files are contained within the plate_map_file.
     if len(files) != len(local_file_names):
         raise ValueError("Plate map file is invalid.")
 
-    for file in files:
-        if file not in local_file_names:
-            raise ValueError(
-                "Plate map file does not contain the attached MS data files."
-            )
+    if not files.isin(local_file_names).all():
+        raise ValueError(
+            "Plate map file does not contain the attached MS data files."
+        )
 
     # Step 2: Validating and mapping the contents of the sample description file.
     if sample_description_file:
         sdf = pd.read_csv(sample_description_file, on_bad_lines="skip")
-        sdf_data = sdf.iloc[:, :]
-
         sdf.rename(columns={"Sample Name": "Sample name"}, inplace=True)
 
+        # Convert the whole file at once rather than row by row.
+        sdf_keys = [camel_case(col) for col in sdf.columns]
+        sdf_names = sdf["Sample name"].tolist()
+        sdf_rows = sdf.astype(object).where(sdf.notna(), "").values.tolist()
+
     # Step 3: CSV manipulation.
-    number_of_rows = df.shape[0]  # for platemap csv
+    sample_ids = df["Sample ID"].tolist()
+    sample_names = df["Sample name"].tolist()
 
-    for i in range(number_of_rows):
-        row = df.iloc[i]
-        sample_id = row["Sample ID"]
-        sample_name = row["Sample name"]
+    for i, (sample_id, sample_name) in enumerate(
+        zip(sample_ids, sample_names)
+    ):
         sample_info = {
             "plateID": plate_id,
             "sampleID": sample_id,
@@ -195,16 +453,8 @@ def get_sample_info(
             "sampleUserGroup": space,
         }
 
-        if sample_description_file:
-            sdf_row = dict(sdf.iloc[i])
-            row_names = list(sdf_row.keys())
-
-            if sdf_row["Sample name"] == sample_name:
-                for row_name in row_names:
-                    sdf_data = sdf_row[row_name]
-                    sample_info[camel_case(row_name)] = (
-                        sdf_data if pd.notna(sdf_data) else ""
-                    )
+        if sample_description_file and sdf_names[i] == sample_name:
+            sample_info.update(zip(sdf_keys, sdf_rows[i]))
 
         res.append(sample_info)
 
@@ -264,84 +514,41 @@ def parse_plate_map_file(plate_map_file, samples, raw_file_paths, space=None):
     """
 
     df = pd.read_csv(plate_map_file, on_bad_lines="skip")
+    _check_plate_map_columns(df, _PLATE_MAP_REQUIRED_COLUMNS)
     number_of_rows = df.shape[0]
     res = []
 
+    # Convert whole columns at once rather than cell by cell.
+    sample_ids = df["Sample ID"].tolist()
+    sample_names = df["Sample name"].tolist()
+    paths = df["MS file name"].map(raw_file_paths).tolist()
+    fields = {
+        key: (
+            df[col].astype(str).where(df[col].notna(), "").tolist()
+            if col in df.columns
+            else [""] * number_of_rows
+        )
+        for key, col in _PLATE_MAP_FIELDS.items()
+    }
+
     for rowIndex in range(number_of_rows):
-        row = df.iloc[rowIndex]
-        path = None
+        path = paths[rowIndex]
         sample_id = None
 
         if (
-            samples[rowIndex]["sample_id"] == row["Sample ID"]
-            and samples[rowIndex]["sample_name"] == row["Sample name"]
+            samples[rowIndex]["sample_id"] == sample_ids[rowIndex]
+            and samples[rowIndex]["sample_name"] == sample_names[rowIndex]
         ):
             sample_id = samples[rowIndex]["id"]
 
-        for filename in raw_file_paths:
-            if filename == row["MS file name"]:
-                path = raw_file_paths[filename]
-
-        if not path or not sample_id:
+        if pd.isna(path) or not path or not sample_id:
             raise ValueError("Plate map file is invalid.")
 
         res.append(
             {
                 "sampleId": str(sample_id),
-                "sample_id_tracking": str(row["Sample ID"]),
-                "wellLocation": (
-                    str(row["Well location"])
-                    if pd.notna(row["Well location"])
-                    else ""
-                ),
-                "nanoparticle": (
-                    str(row["Nanoparticle"])
-                    if pd.notna(row["Nanoparticle"])
-                    else ""
-                ),
-                "nanoparticleID": (
-                    str(row["Nanoparticle ID"])
-                    if pd.notna(row["Nanoparticle ID"])
-                    else ""
-                ),
-                "control": (
-                    str(row["Control"]) if pd.notna(row["Control"]) else ""
-                ),
-                "controlID": (
-                    str(row["Control ID"])
-                    if pd.notna(row["Control ID"])
-                    else ""
-                ),
-                "instrumentName": (
-                    str(row["Instrument name"])
-                    if pd.notna(row["Instrument name"])
-                    else ""
-                ),
-                "dateSamplePrep": (
-                    str(row["Date sample preparation"])
-                    if pd.notna(row["Date sample preparation"])
-                    else ""
-                ),
-                "sampleVolume": (
-                    str(row["Sample volume"])
-                    if pd.notna(row["Sample volume"])
-                    else ""
-                ),
-                "peptideConcentration": (
-                    str(row["Peptide concentration"])
-                    if pd.notna(row["Peptide concentration"])
-                    else ""
-                ),
-                "peptideMassSample": (
-                    str(row["Peptide mass sample"])
-                    if pd.notna(row["Peptide mass sample"])
-                    else ""
-                ),
-                "dilutionFactor": (
-                    str(row["Dilution factor"])
-                    if pd.notna(row["Dilution factor"])
-                    else ""
-                ),
+                "sample_id_tracking": str(sample_ids[rowIndex]),
+                **{key: values[rowIndex] for key, values in fields.items()},
                 "msdataUserGroup": space,
                 "rawFilePath": path,
             }
@@ -368,22 +575,7 @@ def valid_ms_data_file(path):
     if not os.path.exists(path):
         return False
 
-    full_filename = path.split("/")[-1].split(".")
-
-    if len(full_filename) >= 3:
-        extension = f'.{".".join(full_filename[-2:])}'
-    else:
-        extension = f".{full_filename[-1]}"
-
-    return extension.lower() in [
-        ".d",
-        ".d.zip",
-        ".mzml",
-        ".raw",
-        ".mzml",
-        ".wiff",
-        ".wiff.scan",
-    ]
+    return os.path.basename(path).lower().endswith(_MS_DATA_FILE_EXTENSIONS)
 
 
 def download_hook(t):
@@ -418,7 +610,7 @@ def download_hook(t):
 def camel_case(s):
     # Use regular expression substitution to replace underscores and hyphens with spaces,
     # then title case the string (capitalize the first letter of each word), and remove spaces
-    s = sub(r"(_|-)+", " ", s).title().replace(" ", "")
+    s = _WORD_SEPARATORS.sub(" ", s).title().replace(" ", "")
 
-    # Join the string, ensuring the first letter is lowercase
-    return "".join([s[0].lower(), s[1:]])
+    # Ensure the first letter is lowercase
+    return s[:1].lower() + s[1:]
@@ -1,18 +1,60 @@
-from tqdm import tqdm
-
 import os
-import jwt
+import copy
+import time
 import requests
-import urllib.request
-import ssl
 import shutil
-
+import socket
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from typing import List as _List
 
 from ..common import *
 from ..auth import Auth
 from ..objects import PlateMap
 
+# How long, in seconds, analysis protocol lookups are reused for.
+_ANALYSIS_PROTOCOLS_TTL = 300
+
+# (connect, read) timeout in seconds for API calls that don't set their own.
+_DEFAULT_TIMEOUT = (10, 120)
+
+# TCP keepalive probes for pooled connections. The kernel default waits two
+# hours before the first probe, far longer than the usual load balancer idle
+# timeouts (about a minute or more), so probe after 30 idle seconds where the
+# platform lets us tune it.
+_KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)] + [
+    (socket.IPPROTO_TCP, getattr(socket, name), value)
+    for name, value in (
+        ("TCP_KEEPIDLE", 30),
+        ("TCP_KEEPINTVL", 10),
+        ("TCP_KEEPCNT", 3),
+    )
+    if hasattr(socket, name)
+]
+
+
+class _SessionAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that sends TCP keepalive probes on idle connections, so load balancers don't drop them, and applies `_DEFAULT_TIMEOUT` to requests sent without a timeout.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        # urllib3's defaults already disable Nagle's algorithm (TCP_NODELAY).
+        kwargs["socket_options"] = (
+            HTTPConnection.default_socket_options + _KEEPALIVE_OPTIONS
+        )
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = _DEFAULT_TIMEOUT
+        return super().send(request, timeout=timeout, **kwargs)
+
 
 class SeerSDK:
     """
@@ -28,6 +70,9 @@ class SeerSDK:
     """
 
     def __init__(self, username, password, instance="US"):
+        self._session = None
+        self._analysis_protocols = {}
+
         try:
             self._auth = Auth(username, password, instance)
 
@@ -40,6 +85,63 @@ class SeerSDK:
                 "Could not log in.\nPlease check your credentials and/or instance."
             )
 
+    def _on_response(self, response, *args, **kwargs):
+        """
+        ****************
+        [UNEXPOSED METHOD CALL]
+        ****************
+
+        Response hook for the shared session: a 401 means the cached login tokens were rejected, so they are dropped and the next call logs in again.
+        """
+        if response.status_code == 401:
+            self._auth.invalidate_token(
+                response.request.headers.get("Authorization")
+            )
+
+    @contextmanager
+    def _get_auth_session(self):
+        """
+        ****************
+        [UNEXPOSED METHOD CALL]
+        ****************
+
+        Yields the `requests.Session` shared by all API calls of this SDK instance, with its auth headers refreshed.
+
+        The session is created on first use and never closed afterwards, so consecutive calls reuse its pooled keep-alive connections instead of opening a new TCP/TLS connection each time. Connection failures, and 429 or 5xx responses to idempotent requests, are retried with a short exponential backoff. A 401 response drops the cached login tokens, so the next call logs in again.
+
+        Examples
+        -------
+        >>> with self._get_auth_session() as s:
+        ...     s.get(f"{self._auth.url}api/v1/usergroups")
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.mount(
+                "https://",
+                _SessionAdapter(
+                    pool_connections=16,
+                    pool_maxsize=32,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=["GET", "HEAD"],
+                        raise_on_status=False,
+                    ),
+                ),
+            )
+            self._session.hooks["response"].append(self._on_response)
+
+        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
+        self._session.headers.update(
+            {
+                "Authorization": f"{ID_TOKEN}",
+                "access-token": f"{ACCESS_TOKEN}",
+            }
+        )
+
+        yield self._session
+
     def get_spaces(self):
         """
         Fetches a list of spaces for the authenticated user.
@@ -61,23 +163,16 @@ class SeerSDK:
             ]
         """
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = f"{self._auth.url}api/v1/usergroups"
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
+        with self._get_auth_session() as s:
             spaces = s.get(URL)
 
             if spaces.status_code != 200:
                 raise ValueError(
                     "Invalid request. Please check your parameters."
                 )
-            return spaces.json()
+            return load_json(spaces)
 
     def get_plate_metadata(self, plate_id: str = None, df: bool = False):
         """
@@ -123,17 +218,10 @@ class SeerSDK:
         >>> [{ "id": ... }]
         """
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = f"{self._auth.url}api/v1/plates"
         res = []
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
+        with self._get_auth_session() as s:
             plates = s.get(
                 f"{URL}/{plate_id}" if plate_id else URL,
                 params={"all": "true"},
@@ -143,9 +231,9 @@ class SeerSDK:
                     "Invalid request. Please check your parameters."
                 )
             if not plate_id:
-                res = plates.json()["data"]
+                res = load_json(plates)["data"]
             else:
-                res = [plates.json()]
+                res = [load_json(plates)]
 
             for entry in res:
                 del entry["tenant_id"]
@@ -197,11 +285,6 @@ class SeerSDK:
         >>> [{ "project_name": ... }]
         """
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = (
             f"{self._auth.url}api/v1/projects"
             if not project_id
@@ -209,18 +292,16 @@ class SeerSDK:
         )
         res = []
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
+        with self._get_auth_session() as s:
             projects = s.get(URL, params={"all": "true"})
             if projects.status_code != 200:
                 raise ValueError(
                     "Invalid request. Please check your parameters."
                 )
             if not project_id:
-                res = projects.json()["data"]
+                res = load_json(projects)["data"]
             else:
-                res = [projects.json()]
+                res = [load_json(projects)]
 
         for entry in res:
             if "tenant_id" in entry:
@@ -292,42 +373,35 @@ class SeerSDK:
             raise ValueError("You must pass in plate ID or project ID.")
 
         res = []
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = f"{self._auth.url}api/v1/samples"
         sample_params = {"all": "true"}
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
-            if plate_id:
-                try:
-                    self.get_plate_metadata(plate_id)
-                except:
-                    raise ValueError(
-                        "Plate ID is invalid. Please check your parameters and see if the backend is running."
-                    )
-                sample_params["plateId"] = plate_id
-
-            elif project_id:
-                try:
-                    self.get_project_metadata(project_id)
-                except:
-                    raise ValueError(
-                        "Project ID is invalid. Please check your parameters and see if the backend is running."
-                    )
-
-                sample_params["projectId"] = project_id
-
-            samples = s.get(URL, params=sample_params)
+        if plate_id:
+            validate = partial(self.get_plate_metadata, plate_id)
+            error = "Plate ID is invalid. Please check your parameters and see if the backend is running."
+            sample_params["plateId"] = plate_id
+        else:
+            validate = partial(self.get_project_metadata, project_id)
+            error = "Project ID is invalid. Please check your parameters and see if the backend is running."
+            sample_params["projectId"] = project_id
+
+        with self._get_auth_session() as s:
+            # Fetch the samples while the ID is still being validated.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                validation = executor.submit(validate)
+                samples = executor.submit(s.get, URL, params=sample_params)
+
+            try:
+                validation.result()
+            except:
+                raise ValueError(error)
+
+            samples = samples.result()
             if samples.status_code != 200:
                 raise ValueError(
                     "Invalid request. Please check if your plate ID has any samples associated with it."
                 )
-            res = samples.json()["data"]
+            res = load_json(samples)["data"]
 
             for entry in res:
                 del entry["tenant_id"]
@@ -372,25 +446,33 @@ class SeerSDK:
             [2 rows x 26 columns]
         """
         res = []
-        for sample_id in sample_ids:
-            ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-            HEADERS = {
-                "Authorization": f"{ID_TOKEN}",
-                "access-token": f"{ACCESS_TOKEN}",
-            }
-            URL = f"{self._auth.url}api/v1/msdatas/items"
-
-            with requests.Session() as s:
-                s.headers.update(HEADERS)
+        URL = f"{self._auth.url}api/v1/msdatas/items"
+
+        with self._get_auth_session() as s:
+            # One request per sample; issue them concurrently, in order.
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(8, len(sample_ids)))
+            ) as executor:
+                responses = executor.map(
+                    lambda sample_id: s.post(
+                        URL, json={"sampleId": sample_id}
+                    ),
+                    sample_ids,
+                )
 
-                msdatas = s.post(URL, json={"sampleId": sample_id})
+            for msdatas in responses:
+                if msdatas.status_code != 200:
+                    raise ValueError(
+                        "Failed to fetch MS data for your plate ID."
+                    )
 
-                if msdatas.status_code != 200 or not msdatas.json()["data"]:
+                msdatas = load_json(msdatas)["data"]
+                if not msdatas:
                     raise ValueError(
                         "Failed to fetch MS data for your plate ID."
                     )
 
-                res.append(msdatas.json()["data"][0])
+                res.append(msdatas[0])
 
         for entry in res:
             if "tenant_id" in entry:
@@ -442,7 +524,7 @@ class SeerSDK:
 
             [2 rows x 26 columns]
         """
-        plate_samples = self.get_samples_metadata(plate_id=plate_id)
+        plate_samples = self._get_samples_metadata(plate_id=plate_id)
         sample_ids = [sample["id"] for sample in plate_samples]
         return self.get_msdata(sample_ids, df)
 
@@ -549,7 +631,7 @@ class SeerSDK:
             return ValueError("No project ID specified.")
 
         sample_ids = []
-        project_samples = self.get_samples_metadata(
+        project_samples = self._get_samples_metadata(
             project_id=project_id, df=False
         )
 
@@ -558,21 +640,15 @@ class SeerSDK:
                 sample["id"] for sample in project_samples
             ]  # will always contain unique values
             ms_data_files = self.get_msdata(sample_ids=sample_ids, df=False)
+            samples_by_id = {
+                sample["id"]: sample for sample in project_samples
+            }
 
             for ms_data_file in ms_data_files:
-                for sample_index in range(len(project_samples)):
-                    if (
-                        project_samples[sample_index]["id"]
-                        == ms_data_file["sample_id"]
-                    ):
-                        if "ms_data_file" not in project_samples[sample_index]:
-                            project_samples[sample_index]["ms_data_files"] = [
-                                ms_data_file
-                            ]
-                        else:
-                            project_samples[sample_index][
-                                "ms_data_files"
-                            ].append(ms_data_file)
+                sample = samples_by_id.get(ms_data_file["sample_id"])
+
+                if sample is not None:
+                    sample.setdefault("ms_data_files", []).append(ms_data_file)
 
         if df:
             for sample_index in range(len(project_samples)):
@@ -591,10 +667,13 @@ class SeerSDK:
         self,
         analysis_protocol_name: str = None,
         analysis_protocol_id: str = None,
+        refresh: bool = False,
     ):
         """
         Fetches a list of analysis protocols for the authenticated user. If no `analysis_protocol_id` is provided, returns all analysis protocols for the authenticated user. If `analysis_protocol_name` (and no `analysis_protocol_id`) is provided, returns the analysis protocol with the given name, provided it exists.
 
+        Protocols rarely change, so responses are reused for up to 5 minutes: a protocol created or edited in the meantime may not show up until then, unless `refresh` is set.
+
         Parameters
         ----------
         analysis_protocol_id : str, optional
@@ -603,6 +682,9 @@ class SeerSDK:
         analysis_protocol_name : str, optional
             Name of the analysis protocol to be fetched, defaulted to None.
 
+        refresh : bool, optional
+            Whether to fetch the protocols from PAS even if a recent response is available, defaulted to False.
+
         Returns
         -------
         protocols: list
@@ -630,11 +712,6 @@ class SeerSDK:
         >>> [{ "id": ..., "analysis_protocol_name": ... }] # in this case the id would supersede the inputted name.
         """
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = (
             f"{self._auth.url}api/v1/analysisProtocols"
             if not analysis_protocol_id
@@ -642,41 +719,50 @@ class SeerSDK:
         )
         res = []
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
+        # Protocols rarely change, so reuse recent responses per URL.
+        cached = None if refresh else self._analysis_protocols.get(URL)
+        if cached and time.monotonic() - cached[0] < _ANALYSIS_PROTOCOLS_TTL:
+            protocols = copy.deepcopy(cached[1])
+        else:
+            with self._get_auth_session() as s:
+                protocols = s.get(URL, params={"all": "true"})
+                if protocols.status_code != 200:
+                    raise ValueError(
+                        "Invalid request. Please check your parameters."
+                    )
+                protocols = load_json(protocols)
 
-            protocols = s.get(URL, params={"all": "true"})
-            if protocols.status_code != 200:
-                raise ValueError(
-                    "Invalid request. Please check your parameters."
-                )
-            if not analysis_protocol_id and not analysis_protocol_name:
-                res = protocols.json()["data"]
-
-            if analysis_protocol_id and not analysis_protocol_name:
-                res = [protocols.json()]
-
-            if not analysis_protocol_id and analysis_protocol_name:
-                res = [
-                    protocol
-                    for protocol in protocols.json()["data"]
-                    if protocol["analysis_protocol_name"]
-                    == analysis_protocol_name
-                ]
+            self._analysis_protocols[URL] = (
+                time.monotonic(),
+                copy.deepcopy(protocols),
+            )
 
-            for entry in range(len(res)):
-                if "tenant_id" in res[entry]:
-                    del res[entry]["tenant_id"]
+        if not analysis_protocol_id and not analysis_protocol_name:
+            res = protocols["data"]
 
-                if "parameter_file_path" in res[entry]:
-                    # Simple lambda function to find the third occurrence of '/' in the raw file path
-                    location = lambda s: len(s) - len(s.split("/", 3)[-1])
-                    # Slicing the string from the location
-                    res[entry]["parameter_file_path"] = res[entry][
-                        "parameter_file_path"
-                    ][location(res[entry]["parameter_file_path"]) :]
+        if analysis_protocol_id and not analysis_protocol_name:
+            res = [protocols]
 
-            return res
+        if not analysis_protocol_id and analysis_protocol_name:
+            res = [
+                protocol
+                for protocol in protocols["data"]
+                if protocol["analysis_protocol_name"] == analysis_protocol_name
+            ]
+
+        for entry in range(len(res)):
+            if "tenant_id" in res[entry]:
+                del res[entry]["tenant_id"]
+
+            if "parameter_file_path" in res[entry]:
+                # Simple lambda function to find the third occurrence of '/' in the raw file path
+                location = lambda s: len(s) - len(s.split("/", 3)[-1])
+                # Slicing the string from the location
+                res[entry]["parameter_file_path"] = res[entry][
+                    "parameter_file_path"
+                ][location(res[entry]["parameter_file_path"]) :]
+
+        return res
 
     def get_analysis(self, analysis_id: str = None):
         """
@@ -707,17 +793,10 @@ class SeerSDK:
         >>> [{ id: "YOUR_ANALYSIS_ID_HERE", ...}]
         """
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = f"{self._auth.url}api/v1/analyses"
         res = []
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
+        with self._get_auth_session() as s:
             analyses = s.get(
                 f"{URL}/{analysis_id}" if analysis_id else URL,
                 params={"all": "true"},
@@ -727,10 +806,10 @@ class SeerSDK:
                     "Invalid request. Please check your parameters."
                 )
             if not analysis_id:
-                res = analyses.json()["data"]
+                res = load_json(analyses)["data"]
 
             else:
-                res = [analyses.json()["analysis"]]
+                res = [load_json(analyses)["analysis"]]
 
             for entry in range(len(res)):
                 if "tenant_id" in res[entry]:
@@ -790,44 +869,45 @@ class SeerSDK:
                 "Cannot generate links for failed or null analyses."
             )
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = f"{self._auth.url}api/v1/data"
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
-            protein_data = s.get(
-                f"{URL}/protein?analysisId={analysis_id}&retry=false"
-            )
+        with self._get_auth_session() as s:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                protein_data = executor.submit(
+                    s.get,
+                    f"{URL}/protein?analysisId={analysis_id}&retry=false",
+                )
+                peptide_data = executor.submit(
+                    s.get,
+                    f"{URL}/peptide?analysisId={analysis_id}&retry=false",
+                )
 
+            protein_data = protein_data.result()
             if protein_data.status_code != 200:
                 raise ValueError(
                     "Invalid request. Could not fetch protein data. Please check your parameters."
                 )
-            protein_data = protein_data.json()
-
-            peptide_data = s.get(
-                f"{URL}/peptide?analysisId={analysis_id}&retry=false"
-            )
+            protein_data = load_json(protein_data)
 
+            peptide_data = peptide_data.result()
             if peptide_data.status_code != 200:
                 raise ValueError(
                     "Invalid request. Could not fetch peptide data. Please check your parameters."
                 )
 
-            peptide_data = peptide_data.json()
+            peptide_data = load_json(peptide_data)
 
-            links = {
-                "peptide_np": url_to_df(peptide_data["npLink"]["url"]),
-                "peptide_panel": url_to_df(peptide_data["panelLink"]["url"]),
-                "protein_np": url_to_df(protein_data["npLink"]["url"]),
-                "protein_panel": url_to_df(protein_data["panelLink"]["url"]),
+            urls = {
+                "peptide_np": peptide_data["npLink"]["url"],
+                "peptide_panel": peptide_data["panelLink"]["url"],
+                "protein_np": protein_data["npLink"]["url"],
+                "protein_panel": protein_data["panelLink"]["url"],
             }
 
+            # The four result files are independent downloads.
+            with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+                links = dict(zip(urls, executor.map(url_to_df, urls.values())))
+
             if download_path:
                 name = f"{download_path}/downloads/{analysis_id}"
                 if not os.path.exists(name):
@@ -916,26 +996,19 @@ class SeerSDK:
         ]
         """
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = (
             f"{self._auth.url}api/v1/msdataindex/filesinfolder?folder={folder}"
             if not space
             else f"{self._auth.url}api/v1/msdataindex/filesinfolder?folder={folder}&userGroupId={space}"
         )
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
+        with self._get_auth_session() as s:
             files = s.get(URL)
 
             if files.status_code != 200:
                 raise ValueError(
                     "Invalid request. Please check your parameters."
                 )
-            return files.json()["filesList"]
+            return load_json(files)["filesList"]
 
     def download_ms_data_files(
         self, paths: _List[str], download_path: str, space: str = None
@@ -943,6 +1016,8 @@ class SeerSDK:
         """
         Downloads all MS data files for paths passed in the params to the specified download path.
 
+        Each file is saved under its file name directly in the download path, so the paths must not share a file name. Files already in the download path with the size of their PAS copy are not downloaded again.
+
         Parameters
         ----------
         paths : list[str]
@@ -958,8 +1033,6 @@ class SeerSDK:
             Contains the message whether the files were downloaded or not.
         """
 
-        urls = []
-
         if not download_path:
             download_path = os.getcwd()
             print(f"\nDownload path not specified.\n")
@@ -968,31 +1041,34 @@ class SeerSDK:
             print(
                 f'\nThe path "{download_path}" you specified does not exist, was either invalid or not absolute.\n'
             )
-            download_path = f"{os.getcwd()}/downloads"
-
-        name = (
-            download_path if download_path[-1] != "/" else download_path[:-1]
-        )
+            download_path = os.path.join(os.getcwd(), "downloads")
 
-        if not os.path.exists(name):
-            os.makedirs(name)
+        name = os.path.normpath(download_path)
+        os.makedirs(name, exist_ok=True)
 
         print(f'Downloading files to "{name}"\n')
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
         URL = f"{self._auth.url}api/v1/msdataindex/download/getUrl"
-        tenant_id = jwt.decode(ID_TOKEN, options={"verify_signature": False})[
-            "custom:tenantId"
-        ]
 
+        # Each path only needs one presigned URL and one download.
+        paths = list(dict.fromkeys(paths))
+
+        # Files are saved by name alone, so paths in different folders that
+        # share a file name would overwrite each other.
+        targets = {}
         for path in paths:
-            with requests.Session() as s:
-                s.headers.update(HEADERS)
+            targets.setdefault(os.path.basename(path), []).append(path)
+
+        for filename, same_name in targets.items():
+            if len(same_name) > 1:
+                raise ValueError(
+                    f"Paths {', '.join(same_name)} share the file name '{filename}' and would overwrite each other. Please download them separately to different folders."
+                )
+
+        with self._get_auth_session() as s:
+            tenant_id = self._auth.tenant_id
 
+            def get_url(path):
                 download_url = s.post(
                     URL,
                     json={
@@ -1005,49 +1081,33 @@ class SeerSDK:
                     raise ValueError(
                         "Could not download file. Please check if the backend is running."
                     )
-                urls.append(download_url.text)
+                return download_url.text
 
-        for i in range(len(urls)):
-            filename = paths[i].split("/")[-1]
-            url = urls[i]
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(8, len(paths)))
+            ) as executor:
+                urls = list(executor.map(get_url, paths))
 
+        def download(path, url):
+            filename = os.path.basename(path)
             print(f"Downloading {filename}")
 
-            for _ in range(2):
-                try:
-                    with tqdm(
-                        unit="B",
-                        unit_scale=True,
-                        unit_divisor=1024,
-                        miniters=1,
-                        desc=f"Progress",
-                    ) as t:
-                        ssl._create_default_https_context = (
-                            ssl._create_unverified_context
-                        )
-                        urllib.request.urlretrieve(
-                            url,
-                            f"{name}/{filename}",
-                            reporthook=download_hook(t),
-                            data=None,
-                        )
-                        break
-                except:
-                    filename = filename.split("/")
-                    name += "/" + "/".join(
-                        [filename[i] for i in range(len(filename) - 1)]
-                    )
-                    filename = filename[-1]
-                    if not os.path.isdir(f"{name}/{filename}"):
-                        os.makedirs(f"{name}/")
-
-            else:
+            try:
+                download_file(url, os.path.join(name, filename))
+            except (requests.RequestException, OSError):
                 raise ValueError(
                     "Your download failed. Please check if the backend is still running."
                 )
 
             print(f"Finished downloading {filename}\n")
 
+        # Downloads are network bound, so run a few of them at a time. Every
+        # path has its own target file, so no two workers share a file.
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(4, len(paths)))
+        ) as executor:
+            list(executor.map(download, paths, urls))
+
         return {"message": f"Files downloaded successfully to '{name}'"}
 
     def group_analysis_results(self, analysis_id: str, box_plot: dict = None):
@@ -1096,12 +1156,8 @@ class SeerSDK:
         if not analysis_id:
             raise ValueError("Analysis ID cannot be empty.")
 
-        ID_TOKEN, ACCESS_TOKEN = self._auth.get_token()
-        HEADERS = {
-            "Authorization": f"{ID_TOKEN}",
-            "access-token": f"{ACCESS_TOKEN}",
-        }
-        URL = f"{self._auth.url}"
+        URL = f"{self._auth.url}api/v1/groupanalysis"
+        PRE_URL = f"{self._auth.url}api/v2/groupanalysis"
 
         res = {
             "pre": {
@@ -1123,51 +1179,52 @@ class SeerSDK:
             "box_plot": [],
         }
 
-        # Pre-GA data call
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
+        with self._get_auth_session() as s:
+            # The pre and post GA data calls don't depend on each other.
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                protein_pre_data = executor.submit(
+                    s.post,
+                    url=f"{PRE_URL}/protein",
+                    json={"analysisId": analysis_id, "grouping": "condition"},
+                )
+                peptide_pre_data = executor.submit(
+                    s.post,
+                    url=f"{PRE_URL}/peptide",
+                    json={"analysisId": analysis_id, "grouping": "condition"},
+                )
+                get_saved_result = executor.submit(
+                    s.get,
+                    f"{URL}/getSavedResults?analysisid={analysis_id}",
+                )
 
-            protein_pre_data = s.post(
-                url=f"{URL}api/v2/groupanalysis/protein",
-                json={"analysisId": analysis_id, "grouping": "condition"},
-            )
+            # Pre-GA data call
+            protein_pre_data = protein_pre_data.result()
             if protein_pre_data.status_code != 200:
                 raise ValueError(
                     "Invalid request. Could not fetch group analysis protein pre data. Please check your parameters."
                 )
 
-            protein_pre_data = protein_pre_data.json()
+            protein_pre_data = load_json(protein_pre_data)
 
             res["pre"]["protein"] = protein_pre_data
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
-            peptide_pre_data = s.post(
-                url=f"{URL}api/v2/groupanalysis/peptide",
-                json={"analysisId": analysis_id, "grouping": "condition"},
-            )
+            peptide_pre_data = peptide_pre_data.result()
             if peptide_pre_data.status_code != 200:
                 raise ValueError(
                     "Invalid request. Could not fetch group analysis peptide pre data. Please check your parameters."
                 )
 
-            peptide_pre_data = peptide_pre_data.json()
+            peptide_pre_data = load_json(peptide_pre_data)
             res["pre"]["peptide"] = peptide_pre_data
 
-        # Post-GA data call
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
-
-            get_saved_result = s.get(
-                f"{URL}api/v1/groupanalysis/getSavedResults?analysisid={analysis_id}"
-            )
+            # Post-GA data call
+            get_saved_result = get_saved_result.result()
 
             if get_saved_result.status_code != 200:
                 raise ValueError(
                     "Invalid request. Could not fetch group analysis post data. Please check your parameters."
                 )
-            get_saved_result = get_saved_result.json()
+            get_saved_result = load_json(get_saved_result)
 
             # Protein data
             if "pgResult" in get_saved_result:
@@ -1198,23 +1255,17 @@ class SeerSDK:
                     "peptide_processed_long_form_file_url"
                 ] = get_saved_result["peptideProcessedLongFormFileUrl"]
 
-        # Box plot data call
-        if not box_plot:
-            del res["box_plot"]
-            return res
+            # Box plot data call
+            if not box_plot:
+                del res["box_plot"]
+                return res
 
-        with requests.Session() as s:
-            s.headers.update(HEADERS)
             box_plot["feature_type"] = box_plot["feature_type"].lower()
             box_plot_data = s.post(
-                url=f"{URL}api/v1/groupanalysis/rawdata",
+                url=f"{URL}/rawdata",
                 json={
                     "analysisId": analysis_id,
-                    "featureIds": (
-                        ",".join(box_plot["feature_ids"])
-                        if len(box_plot["feature_ids"]) > 1
-                        else box_plot["feature_ids"][0]
-                    ),
+                    "featureIds": ",".join(box_plot["feature_ids"]),
                     "featureType": f"{box_plot['feature_type']}group",
                 },
             )
@@ -1223,7 +1274,7 @@ class SeerSDK:
                     "Invalid request, could not fetch box plot data. Please verify your 'box_plot' parameters, including 'feature_ids' (comma-separated list of feature IDs) and 'feature_type' (needs to be a either 'protein' or 'peptide')."
                 )
 
-            box_plot_data = box_plot_data.json()
+            box_plot_data = load_json(box_plot_data)
             res["box_plot"] = box_plot_data
 
         return res
@@ -91,20 +91,20 @@ class PlateMap:
         ]
 
         for attr in self.__attrs:
-            if not getattr(self, attr):
-                # Replace falsey values with empty lists
-                setattr(self, attr, [])
+            values = getattr(self, attr)
 
-            attr_len = len(getattr(self, attr))
+            if not values:
+                # Replace falsey values with empty lists
+                values = []
+                setattr(self, attr, values)
 
-            if attr_len > self.length:
+            if len(values) > self.length:
                 raise ValueError(
                     "Parameter lengths must not exceed the number of MS files."
                 )
 
-            elif attr_len < self.length:
-                for i in range(self.length - attr_len):
-                    getattr(self, attr).append(None)
+            # Pad shorter parameters with None
+            values.extend([None] * (self.length - len(values)))
 
     def to_dict(self):
         res = {}
@@ -118,7 +118,14 @@ class PlateMap:
         return res
 
     def to_df(self):
-        return pd.DataFrame(self.to_dict())
+        # Build the frame straight from the attribute lists (one array per
+        # column) rather than from the index-keyed dicts of `to_dict`.
+        return pd.DataFrame(
+            {
+                col: getattr(self, attr)
+                for col, attr in zip(self.__cols, self.__attrs)
+            }
+        )
 
     def to_csv(self, path=None):
         if not path:
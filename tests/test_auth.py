@@ -1,4 +1,9 @@
+import copy
+import jwt
+import pickle
 import pytest
+import threading
+import time
 
 from seer_pas_sdk.auth import Auth
 
@@ -46,3 +51,83 @@ def test_invalid_instance(username, password, invalid_instance):
             password=password,
             instance=invalid_instance,
         )
+
+
+@pytest.fixture
+def mock_login(monkeypatch):
+    """Patch `Auth.login` to hand out tokens and count the logins"""
+    logins = []
+
+    def login(self):
+        logins.append(self.username)
+        id_token = jwt.encode(
+            {"exp": time.time() + 3600, "custom:tenantId": "TEST_tenant"},
+            "XXX_fake_signing_key_for_tests_only",
+        )
+        return {"id_token": id_token, "access_token": "TEST_access_token"}
+
+    monkeypatch.setattr(Auth, "login", login)
+    return logins
+
+
+def test_get_token_is_reused(username, password, mock_login):
+    auth = Auth(username=username, password=password)
+
+    assert auth.get_token() == auth.get_token()
+    assert auth.tenant_id == "TEST_tenant"
+    assert mock_login == [username]
+
+
+def test_get_token_refreshes_expired(username, password, mock_login):
+    auth = Auth(username=username, password=password)
+    auth.get_token()
+
+    auth._token_expiry = time.time() - 1
+    auth.get_token()
+
+    assert mock_login == [username, username]
+
+
+def test_invalidate_token(username, password, mock_login):
+    auth = Auth(username=username, password=password)
+    id_token, _ = auth.get_token()
+
+    auth.invalidate_token("XXX_stale_token")
+    auth.get_token()
+    assert mock_login == [username]
+
+    auth.invalidate_token(id_token)
+    auth.get_token()
+    assert mock_login == [username, username]
+
+
+def test_get_token_refreshes_once(username, password, mock_login):
+    auth = Auth(username=username, password=password)
+    barrier = threading.Barrier(4)
+
+    def get_token():
+        barrier.wait()
+        return auth.get_token()
+
+    threads = [threading.Thread(target=get_token) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_login == [username]
+
+
+@pytest.mark.parametrize(
+    "copier", [copy.deepcopy, lambda auth: pickle.loads(pickle.dumps(auth))]
+)
+def test_auth_copies(username, password, mock_login, copier):
+    """Test that a copy, e.g. for multiprocessing, logs in on its own"""
+    auth = Auth(username=username, password=password)
+    auth.get_token()
+
+    auth_copy = copier(auth)
+    auth_copy.get_token()
+
+    assert auth_copy.username == username
+    assert mock_login == [username, username]
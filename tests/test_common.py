@@ -1,5 +1,8 @@
+import math
 import pytest
+import requests
 
+import seer_pas_sdk.common
 from seer_pas_sdk.common import *
 
 
@@ -51,6 +54,27 @@ def test_get_sample_info(platemap_file, mock_sample):
         assert sampleinfo["sampleUserGroup"] == space
 
 
+def test_get_sample_info_sample_description(
+    platemap_file, mock_sample, tmpdir
+):
+    """Test that sample description columns are merged in camelCase"""
+    filename, sample_name, _ = mock_sample
+    sdf_file = tmpdir / "test_sdf.csv"
+    sdf_file.write(f"Sample Name,Sample_type,Volume\n{sample_name},Plasma,\n")
+
+    res = get_sample_info(
+        plate_id="TEST_plate_id",
+        ms_data_files={filename},
+        plate_map_file=platemap_file,
+        space="TEST_space_id",
+        sample_description_file=str(sdf_file),
+    )
+
+    assert res[0]["sampleName"] == sample_name
+    assert res[0]["sampleType"] == "Plasma"
+    assert res[0]["volume"] == ""
+
+
 def test_get_sample_info_missing_file(platemap_file):
     """Test that get_sample_info raises an exception if a file doesn't exist"""
 
@@ -66,6 +90,311 @@ def test_get_sample_info_missing_file(platemap_file):
         )
 
 
+def test_get_sample_info_missing_column(tmpdir):
+    """Test that get_sample_info names the plate map columns it is missing"""
+    outfile = tmpdir / "test_platemap.csv"
+    outfile.write("MS file name,Sample name\ntest.msfile,TEST_sample_name\n")
+
+    with pytest.raises(ValueError, match="Missing columns: Sample ID"):
+        get_sample_info(
+            plate_id="TEST_plate_id",
+            ms_data_files={"test.msfile"},
+            plate_map_file=str(outfile),
+            space="TEST_space_id",
+        )
+
+
+def test_parse_plate_map_file(platemap_file, mock_sample):
+    """Test that parse_plate_map_file maps samples and raw file paths"""
+    filename, sample_name, sample_id = mock_sample
+
+    samples = [
+        {"id": "TEST_id", "sample_id": sample_id, "sample_name": sample_name}
+    ]
+    raw_file_paths = {filename: f"/TEST_bucket/{filename}"}
+    space = "TEST_space_id"
+    res = parse_plate_map_file(platemap_file, samples, raw_file_paths, space)
+
+    assert len(res) == 1
+    assert res[0]["sampleId"] == "TEST_id"
+    assert res[0]["sample_id_tracking"] == sample_id
+    assert res[0]["wellLocation"] == ""
+    assert res[0]["msdataUserGroup"] == space
+    assert res[0]["rawFilePath"] == raw_file_paths[filename]
+
+
+def test_parse_plate_map_file_missing_path(platemap_file, mock_sample):
+    """Test that parse_plate_map_file rejects files without a raw file path"""
+    _, sample_name, sample_id = mock_sample
+
+    samples = [
+        {"id": "TEST_id", "sample_id": sample_id, "sample_name": sample_name}
+    ]
+    with pytest.raises(ValueError):
+        parse_plate_map_file(
+            platemap_file, samples, {"XXX_other_file": "/TEST_bucket/XXX"}
+        )
+
+
+def test_parse_plate_map_file_optional_columns(tmpdir):
+    """Test that parse_plate_map_file sends missing optional columns blank"""
+    outfile = tmpdir / "test_platemap.csv"
+    outfile.write(
+        "MS file name,Sample ID,Sample name,Control\n"
+        "test.msfile,TEST_sample_id,TEST_sample_name,TEST_control\n"
+    )
+
+    samples = [
+        {
+            "id": "TEST_id",
+            "sample_id": "TEST_sample_id",
+            "sample_name": "TEST_sample_name",
+        }
+    ]
+    res = parse_plate_map_file(
+        str(outfile), samples, {"test.msfile": "/TEST_bucket/test.msfile"}
+    )
+
+    assert res[0]["control"] == "TEST_control"
+    assert res[0]["wellLocation"] == ""
+    assert res[0]["dilutionFactor"] == ""
+
+
+def test_parse_plate_map_file_no_rows(tmpdir):
+    """Test that a plate map with only required headers parses to nothing"""
+    outfile = tmpdir / "test_platemap.csv"
+    outfile.write("MS file name,Sample ID,Sample name\n")
+
+    assert parse_plate_map_file(str(outfile), [], {}) == []
+
+
+def test_parse_plate_map_file_missing_columns(tmpdir):
+    """Test that parse_plate_map_file names missing required columns"""
+    outfile = tmpdir / "test_platemap.csv"
+    outfile.write("MS file name,Sample name\ntest.msfile,TEST_sample_name\n")
+
+    with pytest.raises(ValueError, match="Missing columns: Sample ID"):
+        parse_plate_map_file(str(outfile), [], {})
+
+
+class MockResponse:
+    """A streamed response that can fail after sending part of its body"""
+
+    def __init__(
+        self, body, status_code=200, fail_after=None, content_length=None
+    ):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(content_length or len(body))}
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
+
+    def iter_content(self, chunk_size):
+        if self.fail_after is None:
+            yield self.body
+            return
+
+        yield self.body[: self.fail_after]
+        raise requests.ConnectionError("connection reset")
+
+
+@pytest.fixture
+def mock_get(monkeypatch):
+    """Patch `requests.get` in the common module to serve queued responses"""
+    calls = []
+    responses = []
+
+    def get(url, headers=None, **kwargs):
+        calls.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(seer_pas_sdk.common.requests, "get", get)
+    monkeypatch.setattr(seer_pas_sdk.common.time, "sleep", lambda s: None)
+
+    return calls, responses
+
+
+def test_download_file(mock_get, tmpdir):
+    calls, responses = mock_get
+    responses.append(MockResponse(b"0123456789"))
+    outfile = str(tmpdir / "test.raw")
+
+    assert download_file("https://example/test.raw", outfile) == outfile
+
+    with open(outfile, "rb") as f:
+        assert f.read() == b"0123456789"
+    assert not os.path.exists(f"{outfile}.part")
+    assert calls == [{}]
+
+
+def test_download_file_logs_metrics(mock_get, tmpdir, caplog):
+    _, responses = mock_get
+    responses.append(MockResponse(b"0123456789"))
+    outfile = str(tmpdir / "test.raw")
+
+    with caplog.at_level("DEBUG", logger="seer_pas_sdk.common"):
+        download_file("https://example/test.raw", outfile)
+
+    assert "Downloaded test.raw: bytes=10 ttfb=" in caplog.text
+
+
+def test_download_file_skips_existing(mock_get, tmpdir):
+    """Test that a file already downloaded in full is not fetched again"""
+    calls, responses = mock_get
+    responses.append(MockResponse(b"0123456789", fail_after=0))
+    outfile = str(tmpdir / "test.raw")
+    with open(outfile, "wb") as f:
+        f.write(b"9876543210")
+
+    assert download_file("https://example/test.raw", outfile) == outfile
+
+    with open(outfile, "rb") as f:
+        assert f.read() == b"9876543210"
+    assert not os.path.exists(f"{outfile}.part")
+
+
+def test_download_file_resumes(mock_get, tmpdir):
+    """Test that a failed transfer resumes from the bytes already written"""
+    calls, responses = mock_get
+    responses.append(MockResponse(b"0123456789", fail_after=4))
+    responses.append(MockResponse(b"456789", status_code=206))
+    outfile = str(tmpdir / "test.raw")
+
+    download_file("https://example/test.raw", outfile)
+
+    with open(outfile, "rb") as f:
+        assert f.read() == b"0123456789"
+    assert calls == [{}, {"Range": "bytes=4-"}]
+
+
+def test_download_file_short_body(mock_get, tmpdir):
+    """Test that a body shorter than its Content-Length is resumed, not kept"""
+    calls, responses = mock_get
+    responses.append(MockResponse(b"0123", content_length=10))
+    responses.append(MockResponse(b"456789", status_code=206))
+    outfile = str(tmpdir / "test.raw")
+
+    download_file("https://example/test.raw", outfile)
+
+    with open(outfile, "rb") as f:
+        assert f.read() == b"0123456789"
+    assert calls == [{}, {"Range": "bytes=4-"}]
+
+
+def test_download_file_client_error(mock_get, tmpdir):
+    """Test that a 4xx response, e.g. an expired URL, is not retried"""
+    calls, responses = mock_get
+    responses.append(MockResponse(b"", status_code=403))
+    outfile = str(tmpdir / "test.raw")
+
+    with pytest.raises(requests.HTTPError):
+        download_file("https://example/test.raw", outfile)
+
+    assert len(calls) == 1
+    assert not os.path.exists(outfile)
+
+
+def test_download_file_retries_server_error(mock_get, tmpdir):
+    calls, responses = mock_get
+    responses.append(MockResponse(b"", status_code=503))
+    responses.append(MockResponse(b"0123456789"))
+    outfile = str(tmpdir / "test.raw")
+
+    download_file("https://example/test.raw", outfile)
+
+    assert len(calls) == 2
+
+
+def test_download_file_gives_up(mock_get, tmpdir):
+    calls, responses = mock_get
+    responses.extend(
+        MockResponse(b"0123456789", fail_after=4) for _ in range(3)
+    )
+    outfile = str(tmpdir / "test.raw")
+
+    with pytest.raises(requests.ConnectionError):
+        download_file("https://example/test.raw", outfile)
+
+    assert len(calls) == 3
+    assert not os.path.exists(outfile)
+    assert not os.path.exists(f"{outfile}.part")
+
+
+def test_upload_file(monkeypatch, tmpdir):
+    """Test that uploads stream through a multipart transfer config"""
+    uploads = []
+
+    class MockS3Client:
+        def upload_file(self, *args, Config, Callback):
+            uploads.append((args, Config))
+            Callback(10)
+
+    monkeypatch.setattr(
+        seer_pas_sdk.common.boto3, "client", lambda name: MockS3Client()
+    )
+    infile = tmpdir / "test.raw"
+    infile.write_binary(b"0123456789")
+
+    assert upload_file(str(infile), "bucket", max_concurrency=4)
+
+    ((args, config),) = uploads
+    assert args == (str(infile), "bucket", "test.raw")
+    assert config.max_concurrency == 4
+    assert config.multipart_chunksize == 16 * 1024 * 1024
+
+
+def test_upload_file_with_client(monkeypatch, tmpdir):
+    """Test that a caller's client is used instead of creating one"""
+    uploads = []
+
+    class MockS3Client:
+        def upload_file(self, *args, Config, Callback):
+            uploads.append(args)
+
+    def client(name):
+        raise AssertionError("upload_file created its own client")
+
+    monkeypatch.setattr(seer_pas_sdk.common.boto3, "client", client)
+    infile = tmpdir / "test.raw"
+    infile.write_binary(b"0123456789")
+
+    assert upload_file(str(infile), "bucket", s3_client=MockS3Client())
+    assert uploads == [(str(infile), "bucket", "test.raw")]
+
+
+@pytest.mark.parametrize(
+    "filename, valid",
+    [
+        ("test.raw", True),
+        ("test.RAW", True),
+        ("test.v2.raw", True),
+        ("test.d.zip", True),
+        ("test.wiff.scan", True),
+        ("test.mzML", True),
+        ("test.zip", False),
+        ("test.txt", False),
+    ],
+)
+def test_valid_ms_data_file(tmpdir, filename, valid):
+    path = tmpdir / filename
+    path.write("")
+
+    assert valid_ms_data_file(str(path)) == valid
+
+
+def test_valid_ms_data_file_missing(tmpdir):
+    assert not valid_ms_data_file(str(tmpdir / "test.raw"))
+
+
 def test_camel_case():
     assert camel_case("my favorite") == "myFavorite"
     assert camel_case("my Favorite") == "myFavorite"
@@ -97,3 +426,39 @@ def test_camel_case():
     assert camel_case("clap👏Back") == "clap👏Back"
     assert camel_case("Clap👏back") == "clap👏Back"
     assert camel_case("Clap👏Back") == "clap👏Back"
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_decoder(request, monkeypatch):
+    """Run a test with orjson, skipped if it isn't installed, and without"""
+    if request.param == "orjson":
+        orjson = pytest.importorskip("orjson")
+    else:
+        orjson = None
+    monkeypatch.setattr(seer_pas_sdk.common, "orjson", orjson)
+
+
+def test_load_json(json_decoder):
+    """Test that load_json decodes with or without orjson installed"""
+    response = requests.Response()
+    response._content = b'{"a": [1, 2], "b": null}'
+    assert load_json(response) == {"a": [1, 2], "b": None}
+
+
+def test_load_json_non_finite(json_decoder):
+    """Test that NaN/Infinity decode the same with or without orjson"""
+    response = requests.Response()
+    response._content = b'{"p": NaN, "fc": Infinity}'
+
+    res = load_json(response)
+
+    assert math.isnan(res["p"])
+    assert res["fc"] == math.inf
+
+
+def test_load_json_invalid():
+    response = requests.Response()
+    response._content = b"not json"
+
+    with pytest.raises(requests.JSONDecodeError):
+        load_json(response)
@@ -50,6 +50,18 @@ def test_platemap_to_df(platemap):
         assert len(res[k]) == platemap.length
 
 
+def test_platemap_to_df_matches_to_dict():
+    platemap = PlateMap(
+        ms_file_name=["test_0.msfile", "test_1.msfile"],
+        sample_name=["TEST_sample_name_0"],
+        sample_volume=[1.5],
+    )
+
+    pd.testing.assert_frame_equal(
+        platemap.to_df(), pd.DataFrame(platemap.to_dict())
+    )
+
+
 def test_platemap_to_csv_str(platemap):
     res = platemap.to_csv()
 
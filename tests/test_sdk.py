@@ -2,6 +2,18 @@
 `test_sdk` -- high-level tests for the seer-pas-sdk package
 """
 
+import json
+import os
+import pickle
+import pytest
+import requests
+import socket
+import threading
+import time
+
+import seer_pas_sdk.core
+from seer_pas_sdk.core import SeerSDK
+
 
 def test_import():
     """
@@ -9,3 +21,303 @@ def test_import():
     TODO: replace this with more meaningful tests
     """
     import seer_pas_sdk
+
+
+class MockAuth:
+    """Stands in for a logged-in `Auth`"""
+
+    url = "https://secure-https-url.example/"
+    tenant_id = "TEST_tenant"
+
+    def __init__(self, username, password, instance="US"):
+        self.username = username
+        self.invalidated = []
+
+    def get_token(self):
+        return "TEST_id_token", "TEST_access_token"
+
+    def invalidate_token(self, id_token=None):
+        self.invalidated.append(id_token)
+
+
+class MockAPIResponse(requests.Response):
+    """A complete PAS API response with a JSON or plain text body"""
+
+    def __init__(self, body, status_code=200):
+        super().__init__()
+        self.status_code = status_code
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        self._content = body.encode()
+
+
+@pytest.fixture
+def sdk(monkeypatch):
+    """A `SeerSDK` logged in through `MockAuth`"""
+    monkeypatch.setattr(seer_pas_sdk.core, "Auth", MockAuth)
+    return SeerSDK("TEST_user", "TEST_password")
+
+
+@pytest.fixture
+def session(sdk):
+    """The shared session of `sdk`, to patch API calls on"""
+    with sdk._get_auth_session() as s:
+        return s
+
+
+def test_download_ms_data_files(sdk, session, monkeypatch, tmpdir):
+    """Test that each path is downloaded to its own file, once"""
+    lock = threading.Lock()
+    downloads = []
+
+    def post(url, json):
+        return MockAPIResponse(f"https://example/{json['filepath']}")
+
+    def download_file(url, path):
+        with lock:
+            downloads.append((url, path))
+
+    monkeypatch.setattr(session, "post", post)
+    monkeypatch.setattr(seer_pas_sdk.core, "download_file", download_file)
+
+    sdk.download_ms_data_files(["a/x.raw", "b/y.raw", "a/x.raw"], str(tmpdir))
+
+    assert sorted(downloads) == [
+        (
+            "https://example/TEST_tenant/a/x.raw",
+            os.path.join(str(tmpdir), "x.raw"),
+        ),
+        (
+            "https://example/TEST_tenant/b/y.raw",
+            os.path.join(str(tmpdir), "y.raw"),
+        ),
+    ]
+
+
+def test_download_ms_data_files_same_name(sdk, session, monkeypatch, tmpdir):
+    """Test that paths sharing a file name are rejected before downloading"""
+    posts = []
+    monkeypatch.setattr(
+        session, "post", lambda *args, **kwargs: posts.append(args)
+    )
+
+    with pytest.raises(ValueError, match="a/x.raw, b/x.raw share"):
+        sdk.download_ms_data_files(["a/x.raw", "b/x.raw"], str(tmpdir))
+
+    assert posts == []
+
+
+def test_unauthorized_invalidates_token(sdk):
+    """Test that a 401 response drops the cached login tokens"""
+    for status_code in (200, 401):
+        response = MockAPIResponse({}, status_code)
+        response.request = requests.Request(
+            "GET",
+            "https://secure-https-url.example/",
+            headers={"Authorization": "TEST_id_token"},
+        ).prepare()
+        sdk._on_response(response)
+
+    assert sdk._auth.invalidated == ["TEST_id_token"]
+
+
+def test_sdk_pickles(sdk, session):
+    """Test that the SDK, e.g. passed to multiprocessing, can be pickled"""
+    sdk_copy = pickle.loads(pickle.dumps(sdk))
+
+    with sdk_copy._get_auth_session() as s:
+        assert s.headers["Authorization"] == "TEST_id_token"
+
+
+@pytest.fixture
+def mock_protocols(session, monkeypatch):
+    """Serve analysis protocols from `session` and record each request"""
+    requests_sent = []
+
+    def get(url, params=None):
+        requests_sent.append(url)
+        return MockAPIResponse(
+            {
+                "data": [
+                    {
+                        "id": "TEST_protocol_id",
+                        "analysis_protocol_name": "TEST_protocol",
+                        "tenant_id": "TEST_tenant",
+                    }
+                ]
+            }
+        )
+
+    monkeypatch.setattr(session, "get", get)
+    return requests_sent
+
+
+def test_get_analysis_protocols_cached(sdk, mock_protocols):
+    """Test that a recent response is reused unless a refresh is asked for"""
+    protocols = sdk.get_analysis_protocols()
+
+    assert sdk.get_analysis_protocols() == protocols
+    assert len(mock_protocols) == 1
+
+    assert sdk.get_analysis_protocols(refresh=True) == protocols
+    assert len(mock_protocols) == 2
+
+
+def test_get_analysis_protocols_expires(sdk, mock_protocols, monkeypatch):
+    """Test that cached protocols are fetched again after the TTL"""
+    now = time.monotonic()
+    monkeypatch.setattr(seer_pas_sdk.core.time, "monotonic", lambda: now)
+    sdk.get_analysis_protocols()
+
+    now += seer_pas_sdk.core._ANALYSIS_PROTOCOLS_TTL + 1
+    sdk.get_analysis_protocols()
+
+    assert len(mock_protocols) == 2
+
+
+def test_get_analysis_protocols_copies(sdk, mock_protocols):
+    """Test that changing a returned protocol doesn't change later results"""
+    sdk.get_analysis_protocols()[0]["analysis_protocol_name"] = "XXX"
+
+    protocols = sdk.get_analysis_protocols(
+        analysis_protocol_name="TEST_protocol"
+    )
+
+    assert [protocol["id"] for protocol in protocols] == ["TEST_protocol_id"]
+    assert "tenant_id" not in protocols[0]
+    assert len(mock_protocols) == 1
+
+
+@pytest.fixture
+def mock_pas(session, monkeypatch):
+    """Serve a plate and a project holding two samples with an MS data file each"""
+    api = f"{MockAuth.url}api/v1/"
+    samples = [
+        {"id": "TEST_sample_1", "tenant_id": "TEST_tenant"},
+        {"id": "TEST_sample_2", "tenant_id": "TEST_tenant"},
+    ]
+    routes = {
+        f"{api}plates/TEST_plate_id": {
+            "id": "TEST_plate_id",
+            "tenant_id": "TEST_tenant",
+        },
+        f"{api}projects/TEST_project_id": {
+            "id": "TEST_project_id",
+            "tenant_id": "TEST_tenant",
+        },
+        f"{api}samples": {"data": samples},
+    }
+
+    def get(url, params=None):
+        if url not in routes:
+            return MockAPIResponse({}, 404)
+        return MockAPIResponse(routes[url])
+
+    def post(url, json):
+        assert url == f"{api}msdatas/items"
+        sample_id = json["sampleId"]
+        return MockAPIResponse(
+            {
+                "data": [
+                    {
+                        "id": f"TEST_msdata_{sample_id}",
+                        "sample_id": sample_id,
+                        "tenant_id": "TEST_tenant",
+                        "raw_file_path": f"/TEST_tenant/TEST_bucket/{sample_id}.raw",
+                    }
+                ]
+            }
+        )
+
+    monkeypatch.setattr(session, "get", get)
+    monkeypatch.setattr(session, "post", post)
+
+
+def test_get_plate(sdk, mock_pas):
+    """Test that get_plate returns the MS data files of the plate's samples"""
+    res = sdk.get_plate("TEST_plate_id")
+
+    assert res == [
+        {
+            "id": "TEST_msdata_TEST_sample_1",
+            "sample_id": "TEST_sample_1",
+            "raw_file_path": "TEST_sample_1.raw",
+        },
+        {
+            "id": "TEST_msdata_TEST_sample_2",
+            "sample_id": "TEST_sample_2",
+            "raw_file_path": "TEST_sample_2.raw",
+        },
+    ]
+
+
+def test_get_plate_invalid(sdk, mock_pas):
+    with pytest.raises(ValueError, match="Plate ID is invalid"):
+        sdk.get_plate("XXX_plate_id")
+
+
+def test_get_project(sdk, mock_pas):
+    """Test that get_project returns the project's samples"""
+    res = sdk.get_project("TEST_project_id")
+
+    assert res == [{"id": "TEST_sample_1"}, {"id": "TEST_sample_2"}]
+
+
+def test_get_project_msdata(sdk, mock_pas):
+    """Test that get_project attaches each sample's MS data files"""
+    res = sdk.get_project("TEST_project_id", msdata=True, df=True)
+
+    assert res["id"].tolist() == ["TEST_sample_1", "TEST_sample_2"]
+    assert res["ms_data_files"][0]["id"].tolist() == [
+        "TEST_msdata_TEST_sample_1"
+    ]
+
+
+def test_get_project_msdata_multiple_files(sdk, mock_pas, monkeypatch):
+    """Test that a sample keeps all of its MS data files, not just the last"""
+    ms_data_files = [
+        {"id": "TEST_msdata_1", "sample_id": "TEST_sample_1"},
+        {"id": "TEST_msdata_2", "sample_id": "TEST_sample_2"},
+        {"id": "TEST_msdata_3", "sample_id": "TEST_sample_1"},
+    ]
+    monkeypatch.setattr(
+        sdk, "get_msdata", lambda sample_ids, df=False: ms_data_files
+    )
+
+    res = sdk.get_project("TEST_project_id", msdata=True)
+
+    assert res == [
+        {
+            "id": "TEST_sample_1",
+            "ms_data_files": [ms_data_files[0], ms_data_files[2]],
+        },
+        {"id": "TEST_sample_2", "ms_data_files": [ms_data_files[1]]},
+    ]
+
+
+def test_session_adapter_keepalive():
+    """Test that pooled connections send keepalive probes"""
+    adapter = seer_pas_sdk.core._SessionAdapter()
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        assert (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30) in options
+
+
+@pytest.mark.parametrize(
+    "timeout, expected",
+    [(None, seer_pas_sdk.core._DEFAULT_TIMEOUT), (5, 5), ((1, 2), (1, 2))],
+)
+def test_session_adapter_timeout(monkeypatch, timeout, expected):
+    """Test that requests without a timeout get the default one"""
+    sent = []
+
+    def send(self, request, timeout=None, **kwargs):
+        sent.append(timeout)
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+
+    seer_pas_sdk.core._SessionAdapter().send(None, timeout=timeout)
+
+    assert sent == [expected]